@@ -6,7 +6,22 @@ This package contains controller modules for interfacing with hardware devices:
 - tinysa_controller: Interface to tinySA Ultra spectrum analyzer
 """
 
-from .arduino_controller import ArduinoLOController
-from .tinysa_controller import TinySAController
-
 __all__ = ['ArduinoLOController', 'TinySAController']
+
+# PEP 562 lazy re-exports: importing the package — including via
+# `from controllers.arduino_controller import ...` — must not pull in
+# tinysa_controller, whose tsapython/numpy imports cost several
+# hundred ms that fast CLI paths like --list-ports shouldn't pay.
+_SUBMODULES = {
+    'ArduinoLOController': 'arduino_controller',
+    'TinySAController': 'tinysa_controller',
+}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        from importlib import import_module
+        value = getattr(import_module(f'.{_SUBMODULES[name]}', __name__), name)
+        globals()[name] = value  # cache so __getattr__ runs once
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
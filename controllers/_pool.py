@@ -0,0 +1,13 @@
+"""
+Shared worker pool for overlapping controller I/O.
+
+The Arduino and tinySA sit on independent USB devices, so their serial
+round-trips can run concurrently: a sweep can prefetch the next LO
+retune in a worker thread while the main thread runs the current tinySA
+measurement. Each controller serializes access to its own port with an
+internal lock, so two workers are all that is ever useful.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+_POOL = ThreadPoolExecutor(max_workers=2)
@@ -5,30 +5,79 @@ Provides a Python interface to control the ADF4351-based Local Oscillator
 via serial communication with Arduino running ManualControl.ino sketch.
 """
 
+import asyncio
+import os
 import serial
+import threading
 import time
 import re
 from typing import Optional, Tuple
 
 
+# Response parsers, compiled once at import time (hot in status queries)
+_FREQ_RE = re.compile(r'Freq:\s+([\d.]+)\s+MHz')
+_POWER_RE = re.compile(r'Power:\s+([+-]?\d+)\s+dBm')
+
+# Pre-encoded fixed commands to skip per-call format + encode
+_CMD_STATUS = b's\n'
+_CMD_RESET = b'r\n'
+_CMD_TOGGLE_BAND = b'a\n'
+
+# Pre-encoded commands for the ADF4351's four output power settings
+_POWER_CMDS = {-4: b'p -4\n', -1: b'p -1\n', 2: b'p +2\n', 5: b'p +5\n'}
+
+
+def set_port_low_latency(port: str) -> bool:
+    """
+    Reduce the USB-serial driver latency timer for a port
+
+    FTDI/CP210x adapters default to a 16 ms latency timer on Linux, so
+    every short response stalls in the kernel before delivery. Writing 1
+    to the sysfs latency_timer knob drops that to ~1 ms. Requires write
+    permission on the sysfs entry; fails silently otherwise (e.g. on
+    macOS/Windows or non-FTDI adapters, where there is nothing to tune).
+
+    Args:
+        port: Serial port device path (e.g., '/dev/ttyUSB0')
+
+    Returns:
+        True if the latency timer was lowered, False otherwise
+    """
+    tty = os.path.basename(port)
+    latency_path = f"/sys/bus/usb-serial/devices/{tty}/latency_timer"
+    try:
+        with open(latency_path, 'w') as f:
+            f.write('1')
+        return True
+    except OSError:
+        return False
+
+
 class ArduinoLOController:
     """Controller for Arduino-based ADF4351 Local Oscillator"""
     
-    def __init__(self, port: str, baudrate: int = 115200, timeout: float = 2.0):
+    def __init__(self, port: str, baudrate: int = 115200, timeout: float = 2.0,
+                 low_latency: bool = True):
         """
         Initialize Arduino LO controller
-        
+
         Args:
             port: Serial port (e.g., '/dev/cu.usbserial-14110')
             baudrate: Serial baud rate (default: 115200)
             timeout: Serial timeout in seconds
+            low_latency: Request low-latency mode from the USB-serial
+                driver on connect (~1 ms instead of the 16 ms default)
         """
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
+        self.low_latency = low_latency
         self.ser: Optional[serial.Serial] = None
         self.current_freq: Optional[float] = None
         self.current_power: Optional[int] = None
+        # Serializes port access when commands are issued from worker
+        # threads (e.g. prefetched retunes)
+        self._lock = threading.Lock()
         
     def connect(self) -> None:
         """Open serial connection to Arduino"""
@@ -43,9 +92,23 @@ class ArduinoLOController:
                 timeout=self.timeout,
                 write_timeout=self.timeout
             )
-            # Wait for Arduino to reset after serial connection
-            time.sleep(2.0)
-            # Flush any startup messages
+            # Minimize USB-serial driver latency for short command RTTs:
+            # try pyserial's ASYNC_LOW_LATENCY API first, then the
+            # sysfs latency_timer knob for drivers it doesn't cover
+            if self.low_latency:
+                try:
+                    self.ser.set_low_latency_mode(True)
+                except (NotImplementedError, ValueError, OSError):
+                    pass
+                set_port_low_latency(self.port)
+            # Wait for the Arduino to finish resetting: the sketch
+            # prints a READY banner on boot, so block on that instead
+            # of a fixed sleep. Boards typically boot in <1 s; the port
+            # timeout caps the wait for sketches without the banner.
+            self.ser.timeout = 2.5
+            self.ser.read_until(b'READY\n')
+            self.ser.timeout = self.timeout
+            # Flush any remaining startup messages
             self._flush_input()
             print(f"Connected to Arduino at {self.port}")
             
@@ -70,103 +133,223 @@ class ArduinoLOController:
     def _send_command(self, command: str) -> str:
         """
         Send command to Arduino and return response
-        
+
         Args:
             command: Command string (without newline)
-            
+
         Returns:
             Response from Arduino
         """
+        return self._send_raw((command + '\n').encode('utf-8'))
+
+    def _send_raw(self, cmd_bytes: bytes, as_bytes: bool = False):
+        """
+        Send pre-encoded command bytes and return response
+
+        Args:
+            cmd_bytes: Command bytes including trailing newline
+            as_bytes: Return the raw response bytes without decoding
+                (saves the UTF-8 decode when the caller only does
+                substring checks)
+
+        Returns:
+            Response from Arduino (str, or bytes if as_bytes)
+        """
         if self.ser is None or not self.ser.is_open:
             raise ConnectionError("Not connected to Arduino")
-        
-        # Send command
-        cmd_bytes = (command + '\n').encode('utf-8')
-        self.ser.write(cmd_bytes)
-        
-        # Read response (multiple lines until timeout)
-        response_lines = []
-        start_time = time.time()
-        
-        while (time.time() - start_time) < self.timeout:
-            if self.ser.in_waiting > 0:
-                try:
-                    line = self.ser.readline().decode('utf-8').strip()
-                    if line:
-                        response_lines.append(line)
-                except UnicodeDecodeError:
-                    pass  # Skip malformed lines
-            else:
-                # No more data available
-                if response_lines:
-                    break
-                time.sleep(0.01)
-        
-        return '\n'.join(response_lines)
+
+        with self._lock:
+            self.ser.write(cmd_bytes)
+            return self._read_response(as_bytes=as_bytes)
+
+    def _read_response(self, as_bytes: bool = False):
+        """
+        Read a command response from the Arduino
+
+        Blocks in the serial driver for the first line (bounded by the
+        port timeout), then drains any trailing lines already buffered
+        in a single bulk read. This avoids the 10 ms poll granularity
+        and per-line syscalls of a readline loop.
+
+        Args:
+            as_bytes: Return the raw bytes without decoding
+
+        Returns:
+            Response from Arduino (str, or bytes if as_bytes)
+        """
+        # First line: kernel-level blocking read until newline or timeout
+        buf = bytearray(self.ser.read_until(b'\n'))
+
+        # Drain anything else already buffered in one read
+        remaining = self.ser.in_waiting
+        if remaining > 0:
+            buf += self.ser.read(remaining)
+
+        if as_bytes:
+            return bytes(buf)
+
+        # Decode once; replace rather than drop malformed bytes. The
+        # downstream parsers search the full string, so no per-line
+        # splitting/stripping is needed.
+        return buf.decode('utf-8', errors='replace').strip()
     
     def _get_status(self) -> None:
         """Query and parse current status from Arduino"""
-        response = self._send_command('s')
-        
+        response = self._send_raw(_CMD_STATUS)
+
         # Parse frequency from response like "Freq: 900.0 MHz"
-        freq_match = re.search(r'Freq:\s+([\d.]+)\s+MHz', response)
+        freq_match = _FREQ_RE.search(response)
         if freq_match:
             self.current_freq = float(freq_match.group(1))
-        
+
         # Parse power from response like "Power: +5 dBm"
-        power_match = re.search(r'Power:\s+([+-]?\d+)\s+dBm', response)
+        power_match = _POWER_RE.search(response)
         if power_match:
             self.current_power = int(power_match.group(1))
     
-    def set_frequency(self, freq_mhz: float) -> bool:
+    def set_frequency(self, freq_mhz: float, force: bool = False) -> bool:
         """
         Set LO frequency
-        
+
         Args:
             freq_mhz: Frequency in MHz (e.g., 900.0)
-            
+            force: Send the command even if the LO is already at this
+                frequency (skipped by default to save a serial RTT)
+
         Returns:
             True if successful, False otherwise
         """
-        command = f'f {freq_mhz:.3f}'
-        response = self._send_command(command)
-        
-        # Check for success
-        if 'MHz' in response or 'Prog:' in response:
+        # Skip the serial round-trip when the LO is already there
+        if (not force and self.current_freq is not None
+                and abs(self.current_freq - freq_mhz) < 1e-6):
+            return True
+
+        cmd_bytes = f'f {freq_mhz:.3f}\n'.encode('utf-8')
+        response = self._send_raw(cmd_bytes, as_bytes=True)
+
+        # Check for success on the raw bytes; decode only on error
+        if b'MHz' in response or b'Prog:' in response:
             self.current_freq = freq_mhz
             return True
-        elif 'ERR' in response:
-            print(f"Error setting frequency: {response}")
+        elif b'ERR' in response:
+            decoded = response.decode('utf-8', errors='replace').strip()
+            print(f"Error setting frequency: {decoded}")
             return False
         else:
             # Assume success if no error
             self.current_freq = freq_mhz
             return True
     
-    def set_power(self, power_dbm: int) -> bool:
+    def set_frequency_nowait(self, freq_mhz: float) -> None:
+        """
+        Write a frequency command without waiting for the echo
+
+        Fire-and-forget variant of set_frequency for batch sweeps: the
+        command lands in the Arduino's serial FIFO and the echo stays in
+        the input buffer. Call _flush_input (or read a response) before
+        issuing a command whose reply must be parsed.
+
+        Args:
+            freq_mhz: Frequency in MHz (e.g., 900.0)
+        """
+        if self.ser is None or not self.ser.is_open:
+            raise ConnectionError("Not connected to Arduino")
+
+        with self._lock:
+            self.ser.write(f'f {freq_mhz:.3f}\n'.encode('utf-8'))
+        self.current_freq = freq_mhz
+
+    def wait_for_lock(self, timeout: float) -> bool:
+        """
+        Wait for the PLL lock banner after a retune
+
+        The sketch prints LOCKED when the ADF4351 MUXOUT reports lock,
+        so this returns as soon as the PLL actually settles — typically
+        well under the worst-case settling time for small frequency
+        steps. For sketches without the banner the wait caps at
+        `timeout`, which is no worse than a plain sleep.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if the lock banner was seen, False on timeout
+        """
+        if self.ser is None or not self.ser.is_open:
+            raise ConnectionError("Not connected to Arduino")
+
+        with self._lock:
+            old_timeout = self.ser.timeout
+            self.ser.timeout = timeout
+            try:
+                data = self.ser.read_until(b'LOCKED\n')
+            finally:
+                self.ser.timeout = old_timeout
+
+        return b'LOCKED' in data
+
+    def set_power(self, power_dbm: int, force: bool = False) -> bool:
         """
         Set LO output power
-        
+
         Args:
             power_dbm: Output power in dBm (typically -4, -1, +2, or +5)
-            
+            force: Send the command even if the power is already at this
+                setting (skipped by default to save a serial RTT)
+
         Returns:
             True if successful, False otherwise
         """
-        command = f'p {power_dbm:+d}'
-        response = self._send_command(command)
-        
-        # Check for success
-        if 'dBm' in response or 'Power' in response:
+        # Skip the serial round-trip when the power is already set
+        if not force and self.current_power == power_dbm:
+            return True
+
+        # The ADF4351 only has four power settings; use the pre-encoded
+        # command for those and fall back to formatting for anything else
+        cmd_bytes = _POWER_CMDS.get(power_dbm)
+        if cmd_bytes is None:
+            cmd_bytes = f'p {power_dbm:+d}\n'.encode('utf-8')
+        response = self._send_raw(cmd_bytes, as_bytes=True)
+
+        # Check for success on the raw bytes; decode only on error
+        if b'dBm' in response or b'Power' in response:
             self.current_power = power_dbm
             return True
-        elif 'ERR' in response:
-            print(f"Error setting power: {response}")
+        elif b'ERR' in response:
+            decoded = response.decode('utf-8', errors='replace').strip()
+            print(f"Error setting power: {decoded}")
             return False
         else:
             self.current_power = power_dbm
             return True
     
+    async def set_frequency_async(self, freq_mhz: float) -> bool:
+        """
+        Async variant of set_frequency
+
+        Runs the blocking serial I/O in a worker thread so the command
+        round-trip can overlap other awaitables (e.g. a tinySA sweep).
+
+        Args:
+            freq_mhz: Frequency in MHz (e.g., 900.0)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return await asyncio.to_thread(self.set_frequency, freq_mhz)
+
+    async def set_power_async(self, power_dbm: int) -> bool:
+        """
+        Async variant of set_power
+
+        Args:
+            power_dbm: Output power in dBm (typically -4, -1, +2, or +5)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return await asyncio.to_thread(self.set_power, power_dbm)
+
     def get_frequency(self) -> Optional[float]:
         """Get current frequency setting"""
         return self.current_freq
@@ -177,13 +360,13 @@ class ArduinoLOController:
     
     def reset_to_band_start(self) -> bool:
         """Reset to start of current band (command: r)"""
-        response = self._send_command('r')
+        response = self._send_raw(_CMD_RESET)
         self._get_status()  # Update current values
         return 'ERR' not in response
     
     def toggle_band(self) -> bool:
         """Toggle between Band A and Band B (command: a)"""
-        response = self._send_command('a')
+        response = self._send_raw(_CMD_TOGGLE_BAND)
         self._get_status()  # Update current values
         return 'ERR' not in response
     
@@ -5,11 +5,15 @@ Provides a Python interface for measuring peak power at specific frequencies
 using the tinySA Ultra spectrum analyzer.
 """
 
+import asyncio
+import threading
 import time
 import numpy as np
-from typing import Optional, Tuple, List
+from typing import Literal, Optional, Tuple, List
 from tsapython import tinySA
 
+from .arduino_controller import set_port_low_latency
+
 
 class TinySAController:
     """Controller for tinySA Ultra spectrum analyzer"""
@@ -26,6 +30,13 @@ class TinySAController:
         self.tsa = tinySA()
         self.tsa.verboseEnabled = verbose
         self.connected = False
+        # Last-applied device state, used to skip redundant commands
+        self._last_calc: Optional[str] = None
+        self._paused = False
+        # Serializes port access when measurements are issued from
+        # worker threads; reentrant because sweep_points nests into
+        # quick_scan
+        self._lock = threading.RLock()
         
     def connect(self) -> None:
         """Connect to tinySA device"""
@@ -42,7 +53,11 @@ class TinySAController:
                 self.tsa.connect(self.port)
             
             self.connected = True
-            
+
+            # Minimize USB-serial driver latency for the many short
+            # round-trips (hop/scan results) the controller performs
+            self._set_low_latency()
+
             # Get device info
             info = self.tsa.info()
             print(f"Connected to tinySA")
@@ -58,13 +73,46 @@ class TinySAController:
         """Disconnect from tinySA"""
         if self.connected:
             try:
-                self.tsa.resume()  # Resume normal operation
+                self._resume()  # Resume normal operation (if paused)
                 self.tsa.disconnect()
                 self.connected = False
+                self._last_calc = None
                 print("Disconnected from tinySA")
             except Exception as e:
                 print(f"Warning during disconnect: {e}")
     
+    def _set_calc(self, mode: str) -> None:
+        """Set the calc (averaging) mode, skipping unchanged writes"""
+        if mode != self._last_calc:
+            self.tsa.calc(mode)
+            self._last_calc = mode
+
+    def _pause(self) -> None:
+        """Pause the sweep if not already paused"""
+        if not self._paused:
+            self.tsa.pause()
+            self._paused = True
+
+    def _resume(self) -> None:
+        """Resume the sweep if paused"""
+        if self._paused:
+            self.tsa.resume()
+            self._paused = False
+
+    def _set_low_latency(self) -> None:
+        """Lower the USB-serial latency timer on the tinySA port"""
+        # Prefer the explicitly configured port; otherwise reach into
+        # the tsapython serial object to find the auto-detected one
+        port = self.port if self.port and self.port.lower() != 'auto' else None
+        if port is None:
+            for attr in ('serial', 'ser', 'serialPort'):
+                serial_obj = getattr(self.tsa, attr, None)
+                if serial_obj is not None and getattr(serial_obj, 'port', None):
+                    port = serial_obj.port
+                    break
+        if port is not None:
+            set_port_low_latency(port)
+
     def _configure_sa_mode(self) -> None:
         """Configure tinySA for spectrum analyzer measurements"""
         # Set to low input mode (for RF measurements)
@@ -86,17 +134,28 @@ class TinySAController:
         center_freq_mhz: float,
         span_mhz: float = 1.0,
         num_points: int = 101,
-        averaging: int = 1
+        averaging: int = 1,
+        trust_grid: bool = True,
+        averaging_mode: Literal["device", "host"] = "host"
     ) -> Tuple[float, float]:
         """
         Measure peak power at a specific frequency
-        
+
         Args:
             center_freq_mhz: Center frequency in MHz
             span_mhz: Frequency span in MHz
             num_points: Number of measurement points
             averaging: Number of averages (1, 4, or 16)
-            
+            trust_grid: Synthesize the frequency axis locally from the
+                sweep geometry instead of querying it from the device,
+                halving the serial traffic. Set False to fetch the
+                device's actual bin centers.
+            averaging_mode: "host" requests averaging x num_points bins
+                in a single sweep and means adjacent bins on this side,
+                costing ~1 sweep instead of the `averaging` back-to-back
+                sweeps the device runs in its aver4/aver16 modes.
+                "device" keeps the on-device averaging.
+
         Returns:
             Tuple of (peak_power_dbm, peak_frequency_mhz)
         """
@@ -111,44 +170,147 @@ class TinySAController:
         start_hz = int(center_freq_hz - span_hz / 2)
         stop_hz = int(center_freq_hz + span_hz / 2)
         
-        # Set averaging mode
-        if averaging == 4:
-            self.tsa.calc("aver4")
-        elif averaging == 16:
-            self.tsa.calc("aver16")
-        else:
-            self.tsa.calc("off")
-        
-        # Pause sweep for measurement
-        self.tsa.pause()
-        
-        # Perform scan
-        try:
-            # Get frequency array
-            freq_data = self.tsa.hop(start_hz, stop_hz, num_points, 1)
-            freq_values = self._parse_data(freq_data)
-            
-            # Get power measurements
-            power_data = self.tsa.hop(start_hz, stop_hz, num_points, 2)
-            power_values = self._parse_data(power_data)
-            
-            # Resume sweep
-            self.tsa.resume()
-            
-            # Find peak
-            if len(power_values) > 0:
-                peak_idx = np.argmax(power_values)
-                peak_power = power_values[peak_idx]
-                peak_freq = freq_values[peak_idx] / 1e6  # Convert to MHz
-                
-                return (peak_power, peak_freq)
+        # Host-side averaging: one denser sweep instead of `averaging`
+        # device-side sweeps
+        host_avg = averaging_mode == "host" and averaging > 1
+        n_samples = num_points * averaging if host_avg else num_points
+
+        with self._lock:
+            # Set averaging mode (skipped when unchanged from last call)
+            if host_avg:
+                self._set_calc("off")
             else:
-                raise ValueError("No data received from tinySA")
-                
-        except Exception as e:
-            self.tsa.resume()
-            raise RuntimeError(f"Measurement failed: {e}")
+                self._set_calc(
+                    {4: "aver4", 16: "aver16"}.get(averaging, "off")
+                )
+
+            # Pause sweep for measurement; resume is deferred to
+            # disconnect so back-to-back measurements don't ping-pong
+            # pause/resume
+            self._pause()
+
+            # Perform scan
+            try:
+                # Get frequency array: the sweep grid is deterministic
+                # from start/stop/num_points, so synthesize it locally
+                # and skip one full serial round-trip plus its parse
+                if trust_grid:
+                    freq_values = np.linspace(start_hz, stop_hz, num_points)
+                else:
+                    freq_data = self.tsa.hop(start_hz, stop_hz, n_samples, 1)
+                    freq_values = self._parse_data(freq_data, count=n_samples)
+                    if host_avg and freq_values.size == n_samples:
+                        freq_values = freq_values.reshape(
+                            num_points, averaging
+                        ).mean(axis=1)
+
+                # Get power measurements
+                power_data = self.tsa.hop(start_hz, stop_hz, n_samples, 2)
+                power_values = self._parse_data(power_data, count=n_samples)
+                if host_avg and power_values.size == n_samples:
+                    # Mean adjacent bins down to num_points
+                    power_values = power_values.reshape(
+                        num_points, averaging
+                    ).mean(axis=1)
+
+                # Find peak
+                if len(power_values) > 0:
+                    peak_idx = np.argmax(power_values)
+                    peak_power = power_values[peak_idx]
+                    peak_freq = freq_values[peak_idx] / 1e6  # Convert to MHz
+
+                    return (peak_power, peak_freq)
+                else:
+                    raise ValueError("No data received from tinySA")
+
+            except Exception as e:
+                self._resume()
+                raise RuntimeError(f"Measurement failed: {e}")
     
+    def _measure_peak_power_only(
+        self,
+        center_freq_mhz: float,
+        span_mhz: float,
+        num_points: int,
+        averaging: int
+    ) -> float:
+        """
+        Measure peak power without resolving the peak frequency
+
+        Power-only fast path: skips the frequency-axis handling and the
+        argmax indexing of measure_peak_power — one hop round-trip, one
+        vector parse, one max reduction.
+
+        Args:
+            center_freq_mhz: Center frequency in MHz
+            span_mhz: Frequency span in MHz
+            num_points: Number of measurement points
+            averaging: Number of averages (1, 4, or 16)
+
+        Returns:
+            Peak power in dBm
+        """
+        if not self.connected:
+            raise ConnectionError("Not connected to tinySA")
+
+        center_freq_hz = int(center_freq_mhz * 1e6)
+        span_hz = int(span_mhz * 1e6)
+        start_hz = int(center_freq_hz - span_hz / 2)
+        stop_hz = int(center_freq_hz + span_hz / 2)
+
+        with self._lock:
+            self._set_calc({4: "aver4", 16: "aver16"}.get(averaging, "off"))
+            self._pause()
+
+            try:
+                power_data = self.tsa.hop(start_hz, stop_hz, num_points, 2)
+                power_values = self._parse_data(power_data, count=num_points)
+
+                if len(power_values) == 0:
+                    raise ValueError("No data received from tinySA")
+
+                return float(power_values.max())
+
+            except Exception as e:
+                self._resume()
+                raise RuntimeError(f"Measurement failed: {e}")
+
+    def measure_peak_power_into(
+        self,
+        out_power: np.ndarray,
+        idx: int,
+        center_freq_mhz: float,
+        span_mhz: float = 1.0,
+        num_points: int = 101,
+        averaging: int = 1
+    ) -> float:
+        """
+        Measure peak power and write it into a caller-provided buffer
+
+        Lets sweep loops preallocate one result array (np.empty(N)) and
+        fill it in place, instead of accumulating per-point Python
+        objects. Uses the power-only fast path internally.
+
+        Args:
+            out_power: Preallocated result array
+            idx: Index in out_power to write
+            center_freq_mhz: Center frequency in MHz
+            span_mhz: Frequency span in MHz
+            num_points: Number of measurement points
+            averaging: Number of averages (1, 4, or 16)
+
+        Returns:
+            Peak power in dBm (also written to out_power[idx])
+        """
+        peak = self._measure_peak_power_only(
+            center_freq_mhz=center_freq_mhz,
+            span_mhz=span_mhz,
+            num_points=num_points,
+            averaging=averaging
+        )
+        out_power[idx] = peak
+        return peak
+
     def measure_power_at_frequency(
         self,
         freq_mhz: float,
@@ -157,38 +319,69 @@ class TinySAController:
     ) -> float:
         """
         Measure peak power near a specific frequency (simplified interface)
-        
+
         Args:
             freq_mhz: Target frequency in MHz
             span_mhz: Measurement span around target
             averaging: Number of averages
-            
+
         Returns:
             Peak power in dBm
         """
-        peak_power, peak_freq = self.measure_peak_power(
+        return self._measure_peak_power_only(
             center_freq_mhz=freq_mhz,
             span_mhz=span_mhz,
             num_points=51,  # Smaller number for faster measurements
             averaging=averaging
         )
-        
-        return peak_power
     
-    def _parse_data(self, data_bytes: bytearray) -> np.ndarray:
+    async def measure_power_at_frequency_async(
+        self,
+        freq_mhz: float,
+        span_mhz: float = 0.5,
+        averaging: int = 4
+    ) -> float:
+        """
+        Async variant of measure_power_at_frequency
+
+        Runs the blocking serial I/O in a worker thread so the sweep can
+        overlap other awaitables (e.g. LO retune/settling).
+
+        Args:
+            freq_mhz: Target frequency in MHz
+            span_mhz: Measurement span around target
+            averaging: Number of averages
+
+        Returns:
+            Peak power in dBm
+        """
+        return await asyncio.to_thread(
+            self.measure_power_at_frequency, freq_mhz, span_mhz, averaging
+        )
+
+    def _parse_data(self, data_bytes: bytearray, count: int = -1) -> np.ndarray:
         """
         Parse measurement data from tinySA
-        
+
         Args:
             data_bytes: Raw data from tinySA
-            
+            count: Expected number of values; when known a priori the
+                output array is pre-sized exactly, avoiding a grow +
+                copy inside the parser
+
         Returns:
             Numpy array of parsed values
         """
+        # Fast path for empty responses
+        if not data_bytes.strip():
+            return np.empty(0)
+
         try:
+            # NumPy's native text parser: no Python-level float() loop
+            # or intermediate list, one contiguous output allocation
             data_str = data_bytes.decode('utf-8')
-            values = [float(x.strip()) for x in data_str.split() if x.strip()]
-            return np.array(values)
+            return np.fromstring(data_str, dtype=np.float64, sep=' ',
+                                 count=count if count > 0 else -1)
         except Exception as e:
             raise ValueError(f"Failed to parse tinySA data: {e}")
     
@@ -220,43 +413,103 @@ class TinySAController:
         self,
         start_mhz: float,
         stop_mhz: float,
-        num_points: int = 450
+        num_points: int = 450,
+        trust_grid: bool = True
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Perform a quick scan across frequency range
-        
+
         Args:
             start_mhz: Start frequency in MHz
             stop_mhz: Stop frequency in MHz
             num_points: Number of points
-            
+            trust_grid: Synthesize the frequency axis locally instead of
+                querying it from the device (see measure_peak_power)
+
         Returns:
             Tuple of (frequencies_mhz, powers_dbm)
         """
         if not self.connected:
             raise ConnectionError("Not connected to tinySA")
-        
+
         start_hz = int(start_mhz * 1e6)
         stop_hz = int(stop_mhz * 1e6)
-        
-        self.tsa.pause()
-        
-        try:
-            # Get data
-            freq_data = self.tsa.scan(start_hz, stop_hz, num_points, 1)
-            power_data = self.tsa.scan(start_hz, stop_hz, num_points, 2)
-            
-            self.tsa.resume()
-            
-            freqs = self._parse_data(freq_data) / 1e6  # Convert to MHz
-            powers = self._parse_data(power_data)
-            
-            return (freqs, powers)
-            
-        except Exception as e:
-            self.tsa.resume()
-            raise RuntimeError(f"Quick scan failed: {e}")
+
+        with self._lock:
+            self._pause()
+
+            try:
+                # Get data (frequency axis is synthesized locally unless
+                # the caller asks for the device's actual bin centers)
+                if not trust_grid:
+                    freq_data = self.tsa.scan(start_hz, stop_hz, num_points, 1)
+                power_data = self.tsa.scan(start_hz, stop_hz, num_points, 2)
+
+                if trust_grid:
+                    freqs = np.linspace(start_mhz, stop_mhz, num_points)
+                else:
+                    freqs = self._parse_data(freq_data, count=num_points) / 1e6
+                powers = self._parse_data(power_data, count=num_points)
+
+                return (freqs, powers)
+
+            except Exception as e:
+                self._resume()
+                raise RuntimeError(f"Quick scan failed: {e}")
     
+    def sweep_points(
+        self,
+        freqs_mhz: np.ndarray,
+        span_mhz: float = 1.0,
+        averaging: int = 1,
+        bins_per_point: int = 11
+    ) -> np.ndarray:
+        """
+        Measure peak power at several frequencies with a single scan
+
+        Instead of one hop round-trip per target frequency, issue one
+        scan covering the whole band and pick the peak inside each
+        target's span window. Bulk transfer replaces per-point I/O, so
+        total serial cost is one round-trip regardless of point count.
+
+        Args:
+            freqs_mhz: Monotonically increasing target frequencies (MHz)
+            span_mhz: Window around each target to search for the peak
+            averaging: Number of averages (1, 4, or 16)
+            bins_per_point: Scan resolution, bins allotted per target
+
+        Returns:
+            Array of peak powers in dBm, one per target frequency
+        """
+        if not self.connected:
+            raise ConnectionError("Not connected to tinySA")
+
+        freqs = np.asarray(freqs_mhz, dtype=np.float64)
+        if freqs.size == 0:
+            return np.empty(0)
+
+        with self._lock:
+            # Set averaging mode (skipped when unchanged from last call)
+            self._set_calc({4: "aver4", 16: "aver16"}.get(averaging, "off"))
+
+            # One scan covering every target window
+            start_mhz = freqs[0] - span_mhz / 2
+            stop_mhz = freqs[-1] + span_mhz / 2
+            num_points = int(freqs.size * bins_per_point)
+
+            grid, powers = self.quick_scan(start_mhz, stop_mhz, num_points)
+
+        # Peak within each target's span window (vectorized bin lookup)
+        lo = np.searchsorted(grid, freqs - span_mhz / 2, side='left')
+        hi = np.searchsorted(grid, freqs + span_mhz / 2, side='right')
+
+        peaks = np.full(freqs.size, np.nan)
+        for i, (l, h) in enumerate(zip(lo, hi)):
+            if h > l:
+                peaks[i] = powers[l:h].max()
+
+        return peaks
+
     def __enter__(self):
         """Context manager entry"""
         self.connect()
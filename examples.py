@@ -78,32 +78,31 @@ def example_power_comparison():
     print("="*60)
     
     freq = 930.0
-    results = {}
-    
+
     with ArduinoLOController('/dev/cu.usbserial-14110') as arduino:
         with TinySAController(port='auto') as tinysa:
             # Set frequency once
             arduino.set_frequency(freq)
             time.sleep(0.2)
-            
+
             # Measure at +5 dBm
             print(f"\nMeasuring at +5 dBm...")
             arduino.set_power(+5)
             time.sleep(0.2)
-            results['+5 dBm'] = tinysa.measure_power_at_frequency(freq)
-            
+            p_high = tinysa.measure_power_at_frequency(freq)
+
             # Measure at -4 dBm
             print(f"Measuring at -4 dBm...")
             arduino.set_power(-4)
             time.sleep(0.2)
-            results['-4 dBm'] = tinysa.measure_power_at_frequency(freq)
-    
+            p_low = tinysa.measure_power_at_frequency(freq)
+
     # Compare
     print(f"\nResults at {freq} MHz:")
-    for setting, power in results.items():
-        print(f"  {setting}: {power:.2f} dBm")
-    
-    diff = results['+5 dBm'] - results['-4 dBm']
+    print(f"  +5 dBm: {p_high:.2f} dBm")
+    print(f"  -4 dBm: {p_low:.2f} dBm")
+
+    diff = p_high - p_low
     print(f"\nPower difference: {diff:.2f} dB")
 
 
@@ -163,39 +162,123 @@ def example_frequency_sweep():
     print("="*60)
     
     import numpy as np
-    
+    from controllers._pool import _POOL
+
     # Just a few points for demonstration
     frequencies = np.linspace(920.0, 930.0, 11)  # 11 points
-    results = []
-    
+    # Preallocated columnar buffer (SoA) — scales to large sweeps and
+    # keeps the data ready for NumPy postprocessing
+    powers = np.empty(len(frequencies))
+
     with ArduinoLOController('/dev/cu.usbserial-14110') as arduino:
         with TinySAController(port='auto') as tinysa:
             arduino.set_power(+5)
-            
-            for freq in frequencies:
+
+            # The LO is the device under test, so it must hold the
+            # current frequency until the tinySA finishes its window —
+            # retuning mid-measurement would leave the span and record
+            # noise floor. The prefetch therefore goes out only after
+            # the measurement returns: the worker thread hides the
+            # Arduino RTT under the print and loop bookkeeping.
+            retune = _POOL.submit(arduino.set_frequency, frequencies[0])
+
+            for i, freq in enumerate(frequencies):
                 print(f"Measuring {freq:.1f} MHz...", end=' ')
-                
-                # Set frequency
-                arduino.set_frequency(freq)
+
+                # Wait for the in-flight retune, then let the LO settle
+                retune.result()
                 time.sleep(0.1)
-                
+
                 # Measure
-                power = tinysa.measure_power_at_frequency(
+                powers[i] = tinysa.measure_power_at_frequency(
                     freq_mhz=freq,
                     span_mhz=0.5,
                     averaging=1  # Quick measurement
                 )
-                
-                results.append((freq, power))
-                print(f"{power:.2f} dBm")
-    
+
+                # Prefetch the next retune now that this point is done
+                if i + 1 < len(frequencies):
+                    retune = _POOL.submit(
+                        arduino.set_frequency, frequencies[i + 1]
+                    )
+
+                print(f"{powers[i]:.2f} dBm")
+
     # Show results
     print("\nSummary:")
     print("Freq (MHz)  Power (dBm)")
     print("-" * 25)
-    for freq, power in results:
+    for freq, power in zip(frequencies, powers):
         print(f"{freq:8.1f}    {power:8.2f}")
 
+    peak_idx = powers.argmax()
+    print(f"\nPeak: {powers[peak_idx]:.2f} dBm at {frequencies[peak_idx]:.1f} MHz")
+
+
+def example_async_sweep():
+    """
+    Example 6: Pipelined sweep using the async controller APIs
+
+    Overlaps the Arduino command round-trip with the loop bookkeeping
+    between points. The next retune is deliberately issued only after
+    the measurement completes: the LO is the device under test, so
+    moving it mid-measurement would leave the tinySA's span and
+    record noise floor instead of LO power.
+    """
+    print("\n" + "="*60)
+    print("Example 6: Async Pipelined Sweep")
+    print("="*60)
+
+    import asyncio
+    import numpy as np
+
+    frequencies = np.linspace(920.0, 930.0, 11)  # 11 points
+    settling_time = 0.1
+
+    async def run(arduino, tinysa):
+        results = []
+
+        await arduino.set_power_async(+5)
+
+        # Issue the first retune before entering the loop
+        retune = asyncio.create_task(
+            arduino.set_frequency_async(frequencies[0])
+        )
+
+        for i, freq in enumerate(frequencies):
+            # Wait for the in-flight retune, then let the LO settle
+            await retune
+            await asyncio.sleep(settling_time)
+
+            # Start the measurement for this point
+            measure = asyncio.create_task(
+                tinysa.measure_power_at_frequency_async(
+                    freq_mhz=freq,
+                    span_mhz=0.5,
+                    averaging=1
+                )
+            )
+
+            power = await measure
+            results.append((freq, power))
+            print(f"  {freq:7.2f} MHz: {power:7.2f} dBm")
+
+            # Issue the next retune now that this point's measurement
+            # is done; the serial RTT overlaps only the print and loop
+            # bookkeeping above
+            if i + 1 < len(frequencies):
+                retune = asyncio.create_task(
+                    arduino.set_frequency_async(frequencies[i + 1])
+                )
+
+        return results
+
+    with ArduinoLOController('/dev/cu.usbserial-14110') as arduino:
+        with TinySAController(port='auto') as tinysa:
+            results = asyncio.run(run(arduino, tinysa))
+
+    print(f"\nMeasured {len(results)} points")
+
 
 if __name__ == "__main__":
     """
@@ -219,7 +302,8 @@ if __name__ == "__main__":
         # example_power_comparison()
         # example_manual_control()
         # example_frequency_sweep()
-        
+        # example_async_sweep()
+
         print("\n" + "="*60)
         print("Examples complete!")
         print("="*60)
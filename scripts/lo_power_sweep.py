@@ -11,21 +11,32 @@ This script coordinates:
 3. Data collection and storage to CSV or FITS format
 """
 
+from __future__ import annotations
+
 import argparse
+import csv
+import functools
 import sys
 import time
-import yaml
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
-import pandas as pd
-import numpy as np
+from typing import List, Dict, Optional, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from controllers.arduino_controller import ArduinoLOController, find_arduino_ports
-from controllers.tinysa_controller import TinySAController
+# numpy, yaml and the controller modules (which pull in
+# tsapython) are imported lazily where used: cold CLI paths like
+# --list-ports and --help shouldn't pay several hundred ms of import
+# time for modules they never touch.
+
+# Typed result record: one fixed-size row per measurement point
+_RESULT_DTYPE = [
+    ('timestamp_ns', 'i8'),     # ns since epoch (time.time_ns)
+    ('frequency_mhz', 'f8'),
+    ('power_dbm', 'f4'),
+    ('lo_power_setting', 'i1'),
+]
 
 
 class LOPowerSweep:
@@ -41,7 +52,15 @@ class LOPowerSweep:
         self.config = config
         self.arduino: Optional[ArduinoLOController] = None
         self.tinysa: Optional[TinySAController] = None
-        self.results: List[Dict] = []
+        # Preallocated in run_sweep; one typed row per point
+        self._arr: Optional[np.ndarray] = None
+        # Power levels measured at each frequency (set in run)
+        self._power_levels: List[int] = [config['lo_power']]
+        self.errors: List[str] = []
+        # Incremental CSV stream (opened in setup when saving to CSV)
+        self._output_path: Optional[Path] = None
+        self._csv_fh = None
+        self._csv_writer = None
         
     def setup(self) -> None:
         """Initialize hardware connections"""
@@ -49,6 +68,9 @@ class LOPowerSweep:
         print("LO Power Sweep Measurement Setup")
         print("=" * 60)
         
+        from controllers.arduino_controller import ArduinoLOController
+        from controllers.tinysa_controller import TinySAController
+
         # Connect to Arduino
         arduino_port = self.config['arduino_port']
         print(f"\nConnecting to Arduino at {arduino_port}...")
@@ -73,169 +95,335 @@ class LOPowerSweep:
         if self.config.get('attenuation') != 'auto':
             self.tinysa.set_attenuation(self.config['attenuation'])
         
+        # Stream rows to the output CSV as they are measured: memory
+        # stays O(1) for the file and an interrupted sweep keeps every
+        # point measured so far
+        if (self._output_path is not None
+                and self._output_path.suffix.lower() == '.csv'):
+            self._csv_fh = open(self._output_path, 'w', newline='')
+            self._csv_writer = csv.writer(self._csv_fh)
+            self._csv_writer.writerow(
+                ['timestamp_ns', 'frequency_mhz', 'power_dbm',
+                 'lo_power_setting']
+            )
+
         print("\n" + "=" * 60)
         print("Setup complete. Ready for measurements.")
         print("=" * 60 + "\n")
     
-    def generate_frequency_list(self) -> np.ndarray:
+    @functools.cached_property
+    def frequencies(self) -> np.ndarray:
         """
-        Generate list of frequencies to measure
-        
-        Returns:
-            Array of frequencies in MHz
+        Frequencies to measure, in MHz
+
+        The grid is built in integer kHz and divided back to MHz once:
+        float accumulation (linspace or a float arange) produces values
+        like 900.20000000000002 that aren't exact multiples of
+        freq_step, drift the serialized commands off the grid, and make
+        the endpoint/point count depend on rounding. Integer arange is
+        exact, and the point count can't be off by one. Computed once
+        and cached on the instance.
         """
-        freq_start = self.config['freq_start']
-        freq_stop = self.config['freq_stop']
-        freq_step = self.config['freq_step']
-        
-        # Generate frequency array
-        num_points = int((freq_stop - freq_start) / freq_step) + 1
-        frequencies = np.linspace(freq_start, freq_stop, num_points)
-        
-        return frequencies
+        import numpy as np
+
+        khz = np.arange(
+            int(round(self.config['freq_start'] * 1000)),
+            int(round(self.config['freq_stop'] * 1000)) + 1,
+            int(round(self.config['freq_step'] * 1000)),
+            dtype=np.int64
+        )
+        return khz / 1000.0
     
-    def measure_single_frequency(self, freq_mhz: float) -> Dict:
+    def measure_single_frequency(
+        self,
+        freq_mhz: float,
+        settling_time: Optional[float] = None,
+        span_mhz: Optional[float] = None,
+        averaging: Optional[int] = None
+    ) -> Tuple[int, float]:
         """
         Measure power at a single frequency
-        
+
         Args:
             freq_mhz: Frequency in MHz
-            
+            settling_time: LO settle cap in seconds (config default)
+            span_mhz: Measurement span in MHz (config default)
+            averaging: Number of averages (config default)
+
+        The sweep loop passes all three explicitly so the per-point
+        path does no config dict lookups.
+
         Returns:
-            Dictionary with measurement results
+            Tuple of (timestamp_ns, peak_power_dbm)
         """
-        # Set Arduino to this frequency
-        if not self.arduino.set_frequency(freq_mhz):
-            raise RuntimeError(f"Failed to set Arduino frequency to {freq_mhz} MHz")
-        
-        # Wait for settling
-        time.sleep(self.config['settling_time'])
+        if settling_time is None:
+            settling_time = self.config['settling_time']
+        if span_mhz is None:
+            span_mhz = self.config['span']
+        if averaging is None:
+            averaging = self.config['averaging']
+
+        # Issue the retune as a fire-and-forget write: the Arduino
+        # programs the PLL while we wait for lock, so the command
+        # round-trip is hidden under the settle time instead of
+        # preceding it serially.
+        self.arduino.set_frequency_nowait(freq_mhz)
+
+        # Wait on the sketch's LOCKED banner rather than sleeping the
+        # worst-case settling time; sketches without the banner fall
+        # back to the full settling_time cap.
+        self.arduino.wait_for_lock(settling_time)
+
+        # Discard any remaining echo that accumulated during settling
+        self.arduino.ser.reset_input_buffer()
         
         # Measure with tinySA
         peak_power = self.tinysa.measure_power_at_frequency(
             freq_mhz=freq_mhz,
-            span_mhz=self.config['span'],
-            averaging=self.config['averaging']
+            span_mhz=span_mhz,
+            averaging=averaging
         )
         
-        # Record measurement
-        measurement = {
-            'timestamp': datetime.now().isoformat(),
-            'frequency_mhz': freq_mhz,
-            'power_dbm': peak_power,
-            'lo_power_setting': self.config['lo_power']
-        }
-        
-        return measurement
+        # The timestamp is a raw nanosecond tick (one syscall, no
+        # datetime object or ISO string per point); output files store
+        # it as-is
+        return (time.time_ns(), peak_power)
     
     def run_sweep(self) -> None:
-        """Execute full frequency sweep"""
-        frequencies = self.generate_frequency_list()
+        """
+        Execute full frequency sweep
+
+        Measures every level in self._power_levels at each frequency
+        before moving to the next one. Interleaving per point means a
+        multi-power run pays setup and the retune/lock wait once per
+        frequency — the ADF4351 output power is a register write that
+        doesn't drop PLL lock — and keeps the levels thermally matched.
+        """
+        import numpy as np
+
+        frequencies = self.frequencies
+        power_levels = self._power_levels
         total_points = len(frequencies)
+        total_rows = total_points * len(power_levels)
         
         print(f"Starting sweep: {frequencies[0]:.1f} - {frequencies[-1]:.1f} MHz")
         print(f"Total points: {total_points}")
         print(f"Step size: {self.config['freq_step']:.3f} MHz")
-        print(f"LO Power: {self.config['lo_power']} dBm")
+        levels_str = ', '.join(f"{p:+d}" for p in power_levels)
+        print(f"LO Power: {levels_str} dBm")
         print(f"Span: {self.config['span']} MHz")
         print(f"Averaging: {self.config['averaging']}x")
         print()
         
+        # Preallocate the whole results table upfront: no per-row dict
+        # allocation in the loop, and saving hits pandas' zero-copy
+        # structured-array path instead of list-of-dicts inference
+        self._arr = np.empty(total_rows, dtype=_RESULT_DTYPE)
+
+        # Bind hot-loop values and callables as locals once, instead of
+        # per-point dict lookups and attribute chases
+        settling_time = self.config['settling_time']
+        span = self.config['span']
+        averaging = self.config['averaging']
+        measure = self.measure_single_frequency
+        measure_only = self.tinysa.measure_power_at_frequency
+        set_power = self.arduino.set_power
+
+        # Emit at most ~100 progress lines per sweep: a line-buffered
+        # tty flushes on every print, and over a slow PTY those
+        # per-point syscalls add up across a 301-point sweep
+        progress_every = max(1, total_rows // 100)
+
         start_time = time.time()
-        
-        for i, freq in enumerate(frequencies, 1):
-            try:
-                # Measure this frequency
-                measurement = self.measure_single_frequency(freq)
-                self.results.append(measurement)
-                
-                # Progress update
-                power = measurement['power_dbm']
-                elapsed = time.time() - start_time
-                rate = i / elapsed if elapsed > 0 else 0
-                eta = (total_points - i) / rate if rate > 0 else 0
-                
-                print(f"[{i:3d}/{total_points}] "
-                      f"{freq:7.2f} MHz: {power:7.2f} dBm  "
-                      f"({rate:.1f} pt/s, ETA: {eta:.0f}s)")
-                
-            except Exception as e:
-                print(f"ERROR at {freq:.2f} MHz: {e}")
-                # Record error but continue
-                self.results.append({
-                    'timestamp': datetime.now().isoformat(),
-                    'frequency_mhz': freq,
-                    'power_dbm': np.nan,
-                    'lo_power_setting': self.config['lo_power'],
-                    'error': str(e)
-                })
+        row = 0
+
+        for freq in frequencies:
+            for j, lo_power in enumerate(power_levels):
+                row += 1
+                try:
+                    # set_power is a no-op when the level is unchanged,
+                    # so the single-power path pays nothing here
+                    set_power(lo_power)
+                    if j == 0:
+                        # First level at this frequency: retune and
+                        # wait for lock inside measure_single_frequency
+                        ts_ns, power = measure(freq, settling_time,
+                                               span, averaging)
+                    else:
+                        # Same frequency, new power: the PLL is still
+                        # locked, so skip the retune and just give the
+                        # output stage a moment to slew
+                        time.sleep(0.05)
+                        power = measure_only(
+                            freq_mhz=freq, span_mhz=span,
+                            averaging=averaging
+                        )
+                        ts_ns = time.time_ns()
+                    self._arr[row - 1] = (ts_ns, freq, power, lo_power)
+
+                    if self._csv_writer is not None:
+                        self._csv_writer.writerow(
+                            (ts_ns, freq, power, lo_power)
+                        )
+                        if row % 25 == 0:
+                            self._csv_fh.flush()
+
+                    # Progress update (throttled)
+                    if row % progress_every == 0 or row == total_rows:
+                        elapsed = time.time() - start_time
+                        rate = row / elapsed if elapsed > 0 else 0
+                        eta = (total_rows - row) / rate if rate > 0 else 0
+
+                        print(f"[{row:3d}/{total_rows}] "
+                              f"{freq:7.2f} MHz @ {lo_power:+d} dBm: "
+                              f"{power:7.2f} dBm  "
+                              f"({rate:.1f} pt/s, ETA: {eta:.0f}s)")
+
+                except Exception as e:
+                    print(f"ERROR at {freq:.2f} MHz @ {lo_power:+d} dBm: {e}")
+                    # Record the failed point but continue
+                    self._arr[row - 1] = (time.time_ns(), freq, np.nan,
+                                          lo_power)
+                    self.errors.append(f"{freq:.3f} MHz @ {lo_power:+d} dBm: {e}")
+                    if self._csv_writer is not None:
+                        self._csv_writer.writerow(
+                            (self._arr[row - 1]['timestamp_ns'], freq, '',
+                             lo_power)
+                        )
+                        self._csv_fh.flush()
         
         elapsed_total = time.time() - start_time
         print(f"\nSweep completed in {elapsed_total:.1f} seconds")
-        print(f"Average rate: {total_points / elapsed_total:.2f} points/second")
+        print(f"Average rate: {total_rows / elapsed_total:.2f} points/second")
     
-    def save_results(self, output_path: Optional[Path] = None) -> Path:
+    def _resolve_output_path(self, output_path: Optional[Path]) -> Path:
         """
-        Save results to file
-        
+        Resolve the output file path, generating a name if needed
+
         Args:
             output_path: Optional output file path
-            
+
         Returns:
-            Path to saved file
+            Path to write results to (parent directory created)
         """
-        if not self.results:
-            raise ValueError("No results to save")
-        
-        # Generate output filename if not provided
         if output_path is None:
             timestamp = datetime.now().strftime(self.config['timestamp_format'])
             output_dir = Path(self.config['output_dir'])
             output_dir.mkdir(exist_ok=True)
-            
-            lo_power = self.config['lo_power']
-            filename = f"lo_power_sweep_{timestamp}_{lo_power:+d}dBm.csv"
-            output_path = output_dir / filename
+
+            levels = ''.join(f"{p:+d}" for p in self._power_levels)
+            filename = f"lo_power_sweep_{timestamp}_{levels}dBm.csv"
+            return output_dir / filename
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        return output_path
+
+    def save_results(self, output_path: Optional[Path] = None) -> Path:
+        """
+        Save results to file
+
+        When the sweep streamed to CSV, this just closes the stream and
+        prints statistics; otherwise the buffered results are written
+        here.
+
+        Args:
+            output_path: Optional output file path
+
+        Returns:
+            Path to saved file
+        """
+        if self._arr is None:
+            raise ValueError("No results to save")
+
+        # Rows already on disk: close the stream and report
+        if self._csv_writer is not None:
+            self._csv_fh.close()
+            self._csv_fh = None
+            self._csv_writer = None
+            output_path = self._output_path
+            print(f"\nResults saved to: {output_path}")
+            self._print_statistics()
+            return output_path
+
+        if self._output_path is not None and output_path is None:
+            output_path = self._output_path
         else:
-            output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(self.results)
+            output_path = self._resolve_output_path(output_path)
         
-        # Save based on format
-        if output_path.suffix.lower() == '.csv':
-            df.to_csv(output_path, index=False)
-            print(f"\nResults saved to: {output_path}")
-        elif output_path.suffix.lower() in ['.fits', '.fit']:
+        # Save based on format. The CSV paths use the stdlib csv
+        # writer on the structured array directly — no DataFrame
+        # construction, block consolidation, or dtype inference for a
+        # small all-numeric table. FITS wraps the structured array in a
+        # BinTableHDU straight from its memory, instead of copying it
+        # through pandas and an astropy Table on the way out.
+        if output_path.suffix.lower() in ['.fits', '.fit']:
             try:
-                from astropy.table import Table
-                table = Table.from_pandas(df)
-                table.write(output_path, format='fits', overwrite=True)
+                from astropy.io import fits
+                hdu = fits.BinTableHDU(self._arr, name='LO_SWEEP')
+                hdu.header['LO_POWER'] = (self.config['lo_power'],
+                                          'LO power setting [dBm]')
+                hdu.header['FSTART'] = (self.config['freq_start'],
+                                        'Sweep start [MHz]')
+                hdu.header['FSTOP'] = (self.config['freq_stop'],
+                                       'Sweep stop [MHz]')
+                hdu.header['FSTEP'] = (self.config['freq_step'],
+                                       'Frequency step [MHz]')
+                hdu.header['SPAN'] = (self.config['span'],
+                                      'Measurement span [MHz]')
+                hdu.header['AVG'] = (self.config['averaging'],
+                                     'Averages per point')
+                hdu.header['RBW'] = (str(self.config.get('rbw', 'auto')),
+                                     'Resolution bandwidth [kHz]')
+                hdu.writeto(output_path, overwrite=True)
                 print(f"\nResults saved to: {output_path}")
             except ImportError:
                 print("ERROR: astropy not installed. Saving as CSV instead.")
                 output_path = output_path.with_suffix('.csv')
-                df.to_csv(output_path, index=False)
+                self._write_csv(output_path)
                 print(f"Results saved to: {output_path}")
         else:
-            df.to_csv(output_path, index=False)
+            self._write_csv(output_path)
             print(f"\nResults saved to: {output_path}")
         
-        # Print statistics
-        valid_powers = df['power_dbm'].dropna()
+        self._print_statistics()
+
+        return output_path
+
+    def _write_csv(self, output_path: Path) -> None:
+        """Write the buffered results with the stdlib csv writer"""
+        with open(output_path, 'w', newline='') as f:
+            w = csv.writer(f)
+            w.writerow(['timestamp_ns', 'frequency_mhz', 'power_dbm',
+                        'lo_power_setting'])
+            w.writerows(self._arr.tolist())
+
+    def _print_statistics(self) -> None:
+        """Print summary statistics for the measured powers"""
+        import numpy as np
+
+        powers = self._arr['power_dbm']
+        valid_powers = powers[~np.isnan(powers)]
         if len(valid_powers) > 0:
             print(f"\nMeasurement Statistics:")
-            print(f"  Valid measurements: {len(valid_powers)}/{len(df)}")
+            print(f"  Valid measurements: {len(valid_powers)}/{len(powers)}")
             print(f"  Power range: {valid_powers.min():.2f} to {valid_powers.max():.2f} dBm")
             print(f"  Mean power: {valid_powers.mean():.2f} dBm")
-            print(f"  Std deviation: {valid_powers.std():.2f} dB")
-        
-        return output_path
+            print(f"  Std deviation: {valid_powers.std(ddof=1):.2f} dB")
     
     def cleanup(self) -> None:
         """Cleanup hardware connections"""
         print("\nCleaning up...")
+
+        # Close the CSV stream if save_results never ran (e.g. Ctrl+C);
+        # everything measured so far is already on disk
+        if self._csv_fh is not None:
+            try:
+                self._csv_fh.close()
+            except Exception:
+                pass
+            self._csv_fh = None
+            self._csv_writer = None
         
         if self.arduino is not None:
             try:
@@ -249,17 +437,27 @@ class LOPowerSweep:
             except Exception as e:
                 print(f"Warning during tinySA disconnect: {e}")
     
-    def run(self, output_path: Optional[Path] = None) -> Path:
+    def run(
+        self,
+        output_path: Optional[Path] = None,
+        power_levels: Optional[List[int]] = None
+    ) -> Path:
         """
         Run complete measurement sequence
         
         Args:
             output_path: Optional output file path
+            power_levels: LO power levels to interleave per frequency
+                (defaults to the single configured lo_power)
             
         Returns:
             Path to results file
         """
         try:
+            if power_levels is not None:
+                self._power_levels = list(power_levels)
+                self.config['lo_power'] = self._power_levels[0]
+            self._output_path = self._resolve_output_path(output_path)
             self.setup()
             self.run_sweep()
             output_file = self.save_results(output_path)
@@ -268,8 +466,26 @@ class LOPowerSweep:
             self.cleanup()
 
 
+# Direct CLI -> config mappings applied in main(); rbw/attenuation need
+# 'auto'-or-int coercion and are handled separately
+_CLI_TO_CONFIG = [
+    ('arduino', 'arduino_port'),
+    ('tinysa', 'tinysa_port'),
+    ('freq_start', 'freq_start'),
+    ('freq_stop', 'freq_stop'),
+    ('freq_step', 'freq_step'),
+    ('power', 'lo_power'),
+    ('settling_time', 'settling_time'),
+    ('span', 'span'),
+    ('averaging', 'averaging'),
+    ('output_dir', 'output_dir'),
+]
+
+
 def load_config(config_file: Optional[Path] = None) -> Dict:
     """Load configuration from file"""
+    import yaml
+
     if config_file is None:
         config_file = Path(__file__).parent / 'config.yaml'
     
@@ -332,7 +548,8 @@ Examples:
     # Power settings
     parser.add_argument('--power', type=int, help='LO output power (dBm)')
     parser.add_argument('--dual-power', type=int, nargs=2, metavar=('P1', 'P2'),
-                       help='Run two sweeps at different power levels')
+                       help='Measure two power levels per frequency point '
+                            'in one sweep (single output file)')
     
     # Timing
     parser.add_argument('--settling-time', type=float, 
@@ -359,6 +576,8 @@ def main():
     
     # List ports and exit if requested
     if args.list_ports:
+        from controllers.arduino_controller import find_arduino_ports
+
         print("Available Arduino-like ports:")
         ports = find_arduino_ports()
         if ports:
@@ -372,57 +591,30 @@ def main():
     config_file = Path(args.config) if args.config else None
     config = load_config(config_file)
     
-    # Override with command-line arguments
-    if args.arduino:
-        config['arduino_port'] = args.arduino
-    if args.tinysa:
-        config['tinysa_port'] = args.tinysa
-    if args.freq_start:
-        config['freq_start'] = args.freq_start
-    if args.freq_stop:
-        config['freq_stop'] = args.freq_stop
-    if args.freq_step:
-        config['freq_step'] = args.freq_step
-    if args.power:
-        config['lo_power'] = args.power
-    if args.settling_time:
-        config['settling_time'] = args.settling_time
-    if args.span:
-        config['span'] = args.span
-    if args.averaging:
-        config['averaging'] = args.averaging
+    # Override with command-line arguments (data-driven; also treats
+    # explicit zeros as valid overrides, which the old if-chains didn't)
+    for cli_name, cfg_name in _CLI_TO_CONFIG:
+        value = getattr(args, cli_name, None)
+        if value is not None:
+            config[cfg_name] = value
+
     if args.rbw:
         config['rbw'] = args.rbw if args.rbw == 'auto' else int(args.rbw)
     if args.attenuation:
-        config['attenuation'] = args.attenuation if args.attenuation == 'auto' else int(args.attenuation)
-    if args.output_dir:
-        config['output_dir'] = args.output_dir
+        config['attenuation'] = (args.attenuation if args.attenuation == 'auto'
+                                 else int(args.attenuation))
     
-    # Handle dual power measurement
+    # Handle dual power measurement: one sweep, both levels measured
+    # back-to-back at each frequency point. This pays hardware setup
+    # and the per-point retune/lock wait once instead of twice, and
+    # keeps the two levels free of slow thermal drift between runs.
+    # The lo_power_setting column splits the file in post-processing.
+    sweep = LOPowerSweep(config)
+    output_path = Path(args.output) if args.output else None
     if args.dual_power:
-        print("Dual power measurement mode")
-        power_levels = args.dual_power
-        
-        for power in power_levels:
-            config['lo_power'] = power
-            print(f"\n{'='*60}")
-            print(f"Measurement at {power:+d} dBm")
-            print(f"{'='*60}\n")
-            
-            sweep = LOPowerSweep(config)
-            
-            # Generate output path
-            if args.output:
-                base_path = Path(args.output)
-                output_path = base_path.parent / f"{base_path.stem}_{power:+d}dBm{base_path.suffix}"
-            else:
-                output_path = None
-            
-            sweep.run(output_path)
+        print("Dual power measurement mode (interleaved per point)")
+        sweep.run(output_path, power_levels=list(args.dual_power))
     else:
-        # Single power measurement
-        sweep = LOPowerSweep(config)
-        output_path = Path(args.output) if args.output else None
         sweep.run(output_path)
     
     print("\nAll measurements complete!")
@@ -9,23 +9,22 @@ No automated measurements - just sends frequency commands to the Arduino
 and you watch the spectrum analyzer display.
 """
 
-import serial
+import re
 import time
 import sys
 import argparse
 
+# One compiled, case-insensitive alternation beats lower() + five
+# substring checks per port, and this runs on every CLI invocation
+_ARDUINO_DESC_RE = re.compile(r'arduino|ch340|cp210[12]|ftdi|usb.?serial', re.I)
+
 
 def find_arduino_port():
     """Find potential Arduino serial ports"""
     import serial.tools.list_ports
-    
-    ports = []
-    for port in serial.tools.list_ports.comports():
-        if any(keyword in port.description.lower() for keyword in 
-               ['arduino', 'ch340', 'cp2102', 'ftdi', 'usb serial']):
-            ports.append(port.device)
-    
-    return ports
+
+    return [p.device for p in serial.tools.list_ports.comports()
+            if _ARDUINO_DESC_RE.search(p.description or '')]
 
 
 def sweep_lo(port, freq_start=900.0, freq_stop=960.0, freq_step=0.2, 
@@ -47,10 +46,37 @@ def sweep_lo(port, freq_start=900.0, freq_stop=960.0, freq_step=0.2,
     print("="*60)
     
     # Connect to Arduino
+    import serial
+
     print(f"\nConnecting to Arduino at {port}...")
     try:
-        ser = serial.Serial(port, 115200, timeout=2)
-        time.sleep(2)  # Wait for Arduino reset
+        # Bounded write_timeout so a wedged port fails fast instead of
+        # blocking forever; flow control off — the sketch uses none
+        ser = serial.Serial(port, 115200, timeout=2,
+                            write_timeout=0.5, rtscts=False, dsrdtr=False)
+        # Size the OS buffers for burst command streams (Windows-only
+        # API; POSIX drivers size their own)
+        try:
+            ser.set_buffer_size(rx_size=16384, tx_size=16384)
+        except (AttributeError, NotImplementedError, ValueError, OSError):
+            pass
+        # Drop the USB-serial latency timer from its 16 ms default so
+        # each frequency command isn't gated by driver buffering
+        try:
+            ser.set_low_latency_mode(True)
+        except (NotImplementedError, ValueError, OSError):
+            pass  # Not supported on this platform/driver
+        # Force a deterministic reset via DTR, then wait on the READY
+        # banner the sketch prints at the end of setup(). Most boards
+        # boot in 600-900 ms, so this beats a fixed 2 s sleep; sketches
+        # without the banner just pay the 2 s read timeout instead.
+        ser.dtr = False
+        time.sleep(0.05)
+        ser.dtr = True
+        ser.read_until(b'READY\n', size=256)
+        # Once booted the sweep is write-only; a short read timeout
+        # keeps any stray reads from stalling for the full 2 s
+        ser.timeout = 0.05
         ser.reset_input_buffer()
         print("✓ Connected")
     except Exception as e:
